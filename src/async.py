@@ -1,15 +1,21 @@
 import asyncio
-import json
-import re
+import os
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Set
 
 import aiohttp
-import janus
-from requests.compat import urljoin
+import orjson
 
-from models import DiscoveredUrl, ScrapeResult
+try:
+    import uvloop
+except ImportError:  # Windows: default asyncio loop
+    uvloop = None
+
+from links import extract_links, normalize, worth_fetching
+from models import ScrapeResult
 
 
 class WikipediaScraperAsync:
@@ -36,60 +42,50 @@ class WikipediaScraperAsync:
         self.max_workers = max_workers
         self.max_connections = max_connections
 
-    def extract_links(self, html: str, base_url: str) -> list[str]:
-        """
-        Grab absolute Wikipedia links from raw HTML.
-        :param str html: Page HTML.
-        :param str base_url: Needed for relative links.
-        :return list[str]: Found URLs.
-        """
-        href_pattern = re.compile(
-            r'<a\s+(?:[^>]*?\s+)?href=["\'](.*?)["\']', re.IGNORECASE
-        )
-        links = set()
-        for match in href_pattern.findall(html):
-            href = match
-            if href.startswith("http") or href.startswith("/"):
-                if href.startswith("/"):
-                    href = urljoin(base_url, href)
-                if "wikipedia.org" in href:
-                    links.add(href)
-        return list(links)
-
     async def worker(
         self,
         session: aiohttp.ClientSession,
-        queue: janus.Queue,
-        unique_links: Set[str],
+        queue: asyncio.Queue,
+        pool: ProcessPoolExecutor,
+        unique_links: set[str],
     ):
         """
         Worker: fetch a URL, parse, push new ones.
         :param aiohttp.ClientSession session: HTTP client.
-        :param janus.Queue queue: Shared URL queue.
-        :param Set[str] unique_links: Already seen URLs.
+        :param asyncio.Queue queue: Shared URL queue.
+        :param ProcessPoolExecutor pool: Runs the CPU-bound parsing.
+        :param set[str] unique_links: Already seen URLs.
         """
+        loop = asyncio.get_running_loop()
         while True:
-            try:
-                url = await queue.async_q.get()
-            except asyncio.CancelledError:
-                break
+            url = await queue.get()
             if url is None:
-                queue.async_q.task_done()
+                queue.task_done()
                 break
             try:
-                async with session.get(url, timeout=3) as resp:
+                async with session.get(url) as resp:
                     if resp.status != 200:
-                        queue.async_q.task_done()
+                        queue.task_done()
                         continue
-                    text = await resp.text()
-                    links = self.extract_links(text, url)
+                    # raw bytes: decoding happens in the pool, not on the loop
+                    body = await resp.read()
+                    try:
+                        links = await loop.run_in_executor(
+                            pool, extract_links, body, url
+                        )
+                    except BrokenProcessPool:
+                        # a parser process died (OOM, crash): every later submit
+                        # fails too, so parse on the loop rather than drop pages
+                        links = extract_links(body, url)
+                    # unbounded queue: put_nowait never raises, no yield per link
                     for link in links:
                         if link not in unique_links:
                             unique_links.add(link)
-                            await queue.async_q.put(link)
+                            if worth_fetching(link):
+                                queue.put_nowait(link)
             except Exception:
                 continue
-            queue.async_q.task_done()
+            queue.task_done()
 
     async def scrape_async(self) -> ScrapeResult:
         """
@@ -97,44 +93,62 @@ class WikipediaScraperAsync:
         :return ScrapeResult: Links, count, time.
         """
         start_time = time.monotonic()
-        unique_links: Set[str] = set()
-        queue = janus.Queue()
-        await queue.async_q.put(self.start_url)
-        unique_links.add(self.start_url)
+        unique_links: set[str] = set()
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        start_url = normalize(self.start_url)
+        queue.put_nowait(start_url)
+        unique_links.add(start_url)
+
+        # aiodns is unreliable on Windows (proactor loop, negative caching)
+        if sys.platform == "win32":
+            resolver = aiohttp.ThreadedResolver()
+        else:
+            resolver = aiohttp.AsyncResolver()
 
         connector = aiohttp.TCPConnector(
             limit=self.max_connections,
             limit_per_host=self.max_connections,
-            ttl_dns_cache=300,
+            ttl_dns_cache=3600,
+            use_dns_cache=True,
+            resolver=resolver,
         )
 
         headers = {"Accept-Encoding": "gzip, br"}
-
-        async with aiohttp.ClientSession(
-            connector=connector, headers=headers
-        ) as session:
-            workers = [
-                asyncio.create_task(self.worker(session, queue, unique_links))
-                for _ in range(self.max_workers)
-            ]
-
-            # small buffer so we don't overshoot
-            delta = 0.05
-            timeout = max(0.1, self.duration - delta)
-
-            try:
-                await asyncio.wait_for(asyncio.gather(*workers), timeout=timeout)
-            except asyncio.TimeoutError:
-                # kill overrunning tasks
-                for w in workers:
-                    w.cancel()
-                await asyncio.gather(*workers, return_exceptions=True)
+        # built once and held by the session, not per request
+        client_timeout = aiohttp.ClientTimeout(total=3, sock_connect=1, sock_read=3)
+
+        pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        try:
+            async with aiohttp.ClientSession(
+                connector=connector,
+                headers=headers,
+                timeout=client_timeout,
+                trust_env=False,
+                auto_decompress=True,
+                raise_for_status=False,
+            ) as session:
+                # small buffer so we don't overshoot
+                delta = 0.05
+                try:
+                    async with asyncio.timeout(max(0.1, self.duration - delta)):
+                        # on deadline the group cancels every worker, in-flight
+                        # requests included, which frees their connector slots
+                        async with asyncio.TaskGroup() as tg:
+                            for _ in range(self.max_workers):
+                                tg.create_task(
+                                    self.worker(session, queue, pool, unique_links)
+                                )
+                except TimeoutError:
+                    pass
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            # the connector only closes resolvers it created itself
+            await resolver.close()
 
         elapsed = time.monotonic() - start_time
-        discovered = [DiscoveredUrl(url=link).url for link in unique_links]
         return ScrapeResult(
-            unique_links=discovered,
-            count=len(discovered),
+            unique_links=list(unique_links),
+            count=len(unique_links),
             elapsed=elapsed,
         )
 
@@ -150,12 +164,13 @@ class WikipediaScraperAsync:
         :return None
         """
         output = {
-            "💡 unique_links": [str(url) for url in result.unique_links],
+            "💡 unique_links": result.unique_links,
             "💡 count": result.count,
             "⏰ elapsed": result.elapsed,
         }
-        with open(Path.cwd() / filename, "w", encoding="utf-8") as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
+        (Path.cwd() / filename).write_bytes(
+            orjson.dumps(output, option=orjson.OPT_INDENT_2)
+        )
         print(f"✅ Results saved to {filename}")
 
 
@@ -165,7 +180,8 @@ def main():
     :return None
     """
     scraper = WikipediaScraperAsync()
-    result = asyncio.run(scraper.scrape_async())
+    run = uvloop.run if uvloop is not None else asyncio.run
+    result = run(scraper.scrape_async())
     print(f"Count: {result.count}")
     print(f"Elapsed time: {result.elapsed:.2f}s")
     scraper.save(result)
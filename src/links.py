@@ -0,0 +1,97 @@
+import re
+from html import unescape
+from urllib.parse import urlsplit
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # regex fallback below
+    HTMLParser = None
+
+_HREF_RE = re.compile(rb'<a\s(?:[^>]*?\s)?href=["\']([^"\']*)["\']', re.IGNORECASE)
+# host-relative (same host as the page), or wikipedia.org and its subdomains
+# (case-insensitive); no userinfo (@) and only a numeric port, so the real host
+# can't be swapped
+_ACCEPT_RE = re.compile(
+    r"/(?!/)|(?i:(?:https?:)?//(?:[^/?#@]*\.)?wikipedia\.org)(?::\d+)?(?:[/?#]|$)"
+)
+# non-article namespaces and their talk pages: counted, never fetched
+_SKIP_NAMESPACES = frozenset(
+    {"Special", "Talk"}
+    | {
+        f"{namespace}{suffix}"
+        for namespace in (
+            "File",
+            "Help",
+            "User",
+            "Template",
+            "Category",
+            "Wikipedia",
+            "Portal",
+        )
+        for suffix in ("", "_talk")
+    }
+)
+_SKIP_QUERY_RE = re.compile(r"[?&](?:action|oldid)=")
+_TITLE_QUERY_RE = re.compile(r"[?&]title=([^&]*)")
+
+
+def normalize(url: str) -> str:
+    """
+    Drop the fragment and trailing slash so page variants dedup together.
+    :param str url: Absolute URL.
+    :return str: Normalized URL.
+    """
+    url = url.partition("#")[0]
+    if url.endswith("/"):
+        url = url[:-1]
+    return url
+
+
+def worth_fetching(url: str) -> bool:
+    """
+    Tell article pages apart from pages that rarely lead to new articles.
+    :param str url: Normalized absolute URL.
+    :return bool: False for non-article namespaces and edit/history views.
+    """
+    title = url.partition("/wiki/")[2]
+    if not title:
+        # /w/index.php?title=Namespace:Page
+        match = _TITLE_QUERY_RE.search(url)
+        title = match.group(1) if match else ""
+    if title.split(":", 1)[0] in _SKIP_NAMESPACES:
+        return False
+    return _SKIP_QUERY_RE.search(url) is None
+
+
+def extract_links(html: bytes, base_url: str) -> list[str]:
+    """
+    Grab absolute Wikipedia links from raw HTML.
+    Module-level so it can be pickled into a process pool.
+    :param bytes html: Undecoded page body.
+    :param str base_url: Needed for relative links.
+    :return list[str]: Found URLs.
+    """
+    if HTMLParser is not None:
+        hrefs = [
+            node.attributes.get("href") or ""
+            for node in HTMLParser(html).css("a[href]")
+        ]
+    else:
+        # unescape entities (&amp;) like selectolax does for attributes
+        hrefs = [unescape(m.decode("utf-8", "replace")) for m in _HREF_RE.findall(html)]
+    # split the page URL once, then join relative links by concatenation
+    parts = urlsplit(base_url)
+    prefix = f"{parts.scheme}://{parts.netloc}"
+    host = parts.hostname or ""
+    on_wikipedia = host == "wikipedia.org" or host.endswith(".wikipedia.org")
+    links = set()
+    for href in filter(_ACCEPT_RE.match, hrefs):
+        if href.startswith("//"):
+            href = f"{parts.scheme}:{href}"
+        elif href[0] == "/":
+            # never follow relative links off a page that isn't on Wikipedia
+            if not on_wikipedia:
+                continue
+            href = prefix + href
+        links.add(normalize(href))
+    return list(links)
@@ -1,15 +1,6 @@
 from pydantic import BaseModel
 
 
-class DiscoveredUrl(BaseModel):
-    """
-    Represents a discovered Wikipedia URL.
-    :param str url: The discovered URL.
-    """
-
-    url: str
-
-
 class ScrapeResult(BaseModel):
     """
     Represents the result of a Wikipedia scraping session.
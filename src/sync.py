@@ -1,14 +1,13 @@
-import json
 import logging
-import re
 import time
 from collections import deque
 from pathlib import Path
 
+import orjson
 import requests
-from requests.compat import urljoin
 
-from models import DiscoveredUrl, ScrapeResult
+from links import extract_links, normalize, worth_fetching
+from models import ScrapeResult
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 
@@ -32,26 +31,6 @@ class WikipediaScraper:
         """Tiny helper for pretty logs."""
         logging.info(f"{emoji} {message}")
 
-    def extract_links(self, html: str, base_url: str) -> list[str]:
-        """
-        Grab absolute Wikipedia links from raw HTML.
-        :param str html: Page HTML.
-        :param str base_url: Needed for relative links.
-        :return list[str]: Found URLs.
-        """
-        href_pattern = re.compile(
-            r'<a\s+(?:[^>]*?\s+)?href=["\'](.*?)["\']', re.IGNORECASE
-        )
-        links = set()
-        for match in href_pattern.findall(html):
-            href = match
-            if href.startswith("http") or href.startswith("/"):
-                if href.startswith("/"):
-                    href = urljoin(base_url, href)
-                if "wikipedia.org" in href:
-                    links.add(href)
-        return list(links)
-
     def scrape(self) -> ScrapeResult:
         """
         Run the crawl.
@@ -62,8 +41,9 @@ class WikipediaScraper:
         unique_links: set[str] = set()
         queue: deque[str] = deque()
         session = requests.Session()
-        queue.append(self.start_url)
-        unique_links.add(self.start_url)
+        start_url = normalize(self.start_url)
+        queue.append(start_url)
+        unique_links.add(start_url)
         delta = 0.1  # small buffer
 
         self.log(f"Starting scraping from {self.start_url}", "💡")
@@ -74,20 +54,20 @@ class WikipediaScraper:
                 if resp.status_code != 200:
                     self.log(f"Failed to fetch {url} (status {resp.status_code})", "⚠️")
                     continue
-                links = self.extract_links(resp.text, url)
+                links = extract_links(resp.content, url)
                 for link in links:
                     if link not in unique_links:
                         unique_links.add(link)
-                        queue.append(link)
+                        if worth_fetching(link):
+                            queue.append(link)
             except Exception as e:
                 self.log(f"Error fetching {url}: {e}", "❌")
         elapsed = time.monotonic() - start_time
 
-        # Validation via Pydantic
-        discovered = [DiscoveredUrl(url=link).url for link in unique_links]
+        # Validated once by Pydantic, not per URL
         return ScrapeResult(
-            unique_links=discovered,
-            count=len(discovered),
+            unique_links=list(unique_links),
+            count=len(unique_links),
             elapsed=elapsed,
         )
 
@@ -102,12 +82,13 @@ class WikipediaScraper:
         :param str filename: Output file.
         """
         output = {
-            "💡 unique_links": [str(url) for url in result.unique_links],
+            "💡 unique_links": result.unique_links,
             "💡 count": result.count,
             "⏰ elapsed": result.elapsed,
         }
-        with open(Path.cwd() / filename, "w", encoding="utf-8") as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
+        (Path.cwd() / filename).write_bytes(
+            orjson.dumps(output, option=orjson.OPT_INDENT_2)
+        )
         print(f"✅ Results saved to {filename}")
 
 